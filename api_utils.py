@@ -1,6 +1,7 @@
 # api_utils.py
 
 import numpy as np
+import pandas as pd
 from pydantic import BaseModel, validator, Field
 from typing import Dict, Any, List
 from urllib.parse import urlparse
@@ -78,6 +79,18 @@ def clean_features(features: dict) -> dict:
                 features[key] = 0
     return features
 
+def clean_features_df(df: pd.DataFrame) -> pd.DataFrame:
+    """Vectorized clean_features: one sweep over the whole feature frame.
+
+    Coerces every column to numeric and zeroes out anything that comes back
+    NaN/inf, replacing the per-key isinstance checks with C loops.
+    """
+    return (
+        df.apply(pd.to_numeric, errors='coerce')
+        .replace([np.inf, -np.inf], np.nan)
+        .fillna(0)
+    )
+
 def classify_prediction(result_value) -> tuple:
     try:
         result_value = int(result_value)
@@ -3,12 +3,16 @@ Interactive URL Feature Extractor for Phishing Detection
 Usage: python url_feature_extractor.py
 """
 
-import csv
 import re
 import socket
 import ssl
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import urlparse
 from datetime import datetime
+import numpy as np
+import pandas as pd
 import tldextract
 
 try:
@@ -26,8 +30,55 @@ try:
 except:
     dns = None
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
 SHORTENERS = {"bit.ly", "goo.gl", "tinyurl.com", "ow.ly", "t.co", "is.gd", "buff.ly", "adf.ly"}
 
+# Shared pool for the per-URL network fanout (HTTP fetch, WHOIS, SSL, DNS).
+_IO_POOL = ThreadPoolExecutor(max_workers=16)
+
+# One session for all fetches so connections (and TLS handshakes) are reused
+# across URLs on the same host instead of rebuilt per request.
+if requests:
+    _SESSION = requests.Session()
+    _adapter = requests.adapters.HTTPAdapter(pool_connections=100, pool_maxsize=100)
+    _SESSION.mount('http://', _adapter)
+    _SESSION.mount('https://', _adapter)
+else:
+    _SESSION = None
+
+# One shared extractor built at import time; suffix_list_urls=() pins it to the
+# bundled PSL snapshot so it never tries to download the list at runtime.
+TLD_EXTRACT = tldextract.TLDExtract(suffix_list_urls=())
+
+@lru_cache(maxsize=4096)
+def _registered_domain(netloc):
+    """Registered domain for a netloc, cached — pages repeat the same few hosts."""
+    return TLD_EXTRACT(netloc).registered_domain if netloc else ''
+
+def _same_registered_domain(page_domain, netloc):
+    """True if netloc's registered domain equals page_domain.
+
+    Fast path: a host equal to the page domain, or ending in '.<page domain>',
+    shares its registered domain by construction — that covers nearly every
+    internal link without touching the PSL. Anything else falls back to the
+    cached tldextract lookup.
+    """
+    if page_domain:
+        host = netloc.rpartition('@')[2].partition(':')[0].lower()
+        if host == page_domain or host.endswith('.' + page_domain):
+            return True
+    return _registered_domain(netloc) == page_domain
+
+@lru_cache(maxsize=4096)
+def _subdomain_count(host):
+    """Number of subdomain labels for a host, cached."""
+    sub = TLD_EXTRACT(host).subdomain
+    return len(sub.split('.')) if sub else 0
+
 COLUMNS = [
     "having_IP_Address", "URL_Length", "Shortining_Service", "having_At_Symbol",
     "double_slash_redirecting", "Prefix_Suffix", "having_Sub_Domain", "SSLfinal_State",
@@ -38,47 +89,145 @@ COLUMNS = [
     "Statistical_report", "Result"
 ]
 
+# All HTML signals combined into one alternation so the page is scanned once
+# instead of once per feature. Branch order matters: the specific tag patterns
+# (favicon link, anchor, meta/script/link, form) must come before the generic
+# src/href branch so matches are routed to the right counter. Expects input
+# that has already been lowercased — case-folding once is far cheaper than
+# running the whole scan under IGNORECASE.
+_HTML_SCAN_RE = re.compile(
+    r'<link[^>]+rel=["\']?(?:icon|shortcut icon)["\']?[^>]+href=[\'"](?P<favicon>[^\'"]+)'
+    r'|<a[^>]+href=["\'](?P<anchor>[^"\']+)'
+    r'|<(?:meta|script|link)[^>]+(?:src|href)=["\'](?P<tag>[^"\']+)'
+    r'|<form[^>]+action=["\'](?P<form>[^"\']*)'
+    r'|(?:src|href)=["\'](?P<link>[^"\']+)'
+)
+
+_IP_RE = re.compile(r'^\d+\.\d+\.\d+\.\d+$')
+
+# Netloc of an absolute URL (input is already lowercased by the HTML scan).
+_NETLOC_RE = re.compile(r'^[a-z][a-z0-9+.\-]*://([^/?#]+)')
+
+def _link_netloc(link):
+    """Netloc of an href/src value without the full urlparse machinery.
+
+    Handles absolute and scheme-relative URLs; anything else is page-local
+    and returns ''.
+    """
+    m = _NETLOC_RE.match(link)
+    if m:
+        return m.group(1)
+    if link.startswith('//'):
+        return link[2:].partition('/')[0].partition('?')[0].partition('#')[0]
+    return ''
+
+def _scan_html(html):
+    """Collect every HTML feature signal in a single pass over the page.
+
+    Expects html to be lowercased already. A URL matched by a specific branch
+    (favicon/anchor/tag) also counts as a generic src/href link, mirroring
+    the overlapping per-feature scans this replaces.
+    """
+    favicon = None
+    links, anchors, tags, forms = [], [], [], []
+    for m in _HTML_SCAN_RE.finditer(html):
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == "favicon":
+            if favicon is None:
+                favicon = value
+            tags.append(value)
+            links.append(value)
+        elif kind == "anchor":
+            anchors.append(value)
+            links.append(value)
+        elif kind == "tag":
+            tags.append(value)
+            links.append(value)
+        elif kind == "form":
+            forms.append(value)
+        else:
+            links.append(value)
+    # The existence flags are checked against the whole page, like the DOM
+    # path does: folding them into the alternation missed signals sitting
+    # before the href/src inside an already-consumed tag span (e.g.
+    # <a onmouseover=... href=...>).
+    flags = {
+        "mailto": 'mailto:' in html,
+        "mouseover": _MOUSEOVER_RE.search(html) is not None,
+        "rightclick": _RIGHTCLICK_RE.search(html) is not None,
+        "popup": _POPUP_RE.search(html) is not None,
+        "iframe": '<iframe' in html,
+    }
+    return favicon, links, anchors, tags, forms, flags
+
 def fetch_content(url):
     """Fetch URL content"""
-    if not requests:
+    if not _SESSION:
         return None, None
     try:
-        r = requests.get(url, timeout=10, allow_redirects=True, 
-                        headers={"User-Agent": "Mozilla/5.0"}, verify=False)
+        r = _SESSION.get(url, timeout=10, allow_redirects=True,
+                        headers={"User-Agent": "Mozilla/5.0", "Connection": "keep-alive"},
+                        verify=False)
         return r.status_code, r.text[:100000]
     except:
         return None, None
 
+# WHOIS answers change on day scales, not per request — cache them for 24h
+# keyed by registered domain so batches with repeated domains pay one lookup.
+_WHOIS_TTL = 86400
+_whois_cache = {}
+
 def get_domain_age(domain):
     """Get domain age in days"""
     if not whois or not domain:
         return None
+    cached = _whois_cache.get(domain)
+    if cached and time.time() - cached[1] < _WHOIS_TTL:
+        return cached[0]
+    age = None
     try:
         w = whois.whois(domain)
         cd = w.creation_date
         if isinstance(cd, list):
             cd = cd[0]
         if cd and not isinstance(cd, str):
-            return (datetime.now() - cd).days
+            age = (datetime.now() - cd).days
     except:
         pass
-    return None
+    if len(_whois_cache) > 10000:
+        _whois_cache.clear()
+    _whois_cache[domain] = (age, time.time())
+    return age
+
+# One TLS context for every check (the CA bundle is read from disk once) and
+# a per-host verdict cache — certificate state changes on hour scales, so
+# repeat hosts in a batch skip the handshake entirely.
+_SSL_CTX = ssl.create_default_context()
+_SSL_TTL = 6 * 3600
+_ssl_cache = {}
 
 def check_ssl(url, host):
     """Check SSL certificate validity"""
     if not url.startswith('https'):
         return -1
+    cached = _ssl_cache.get(host)
+    if cached and time.time() - cached[1] < _SSL_TTL:
+        return cached[0]
     try:
-        ctx = ssl.create_default_context()
+        verdict = 1
         with socket.create_connection((host, 443), timeout=5) as sock:
-            with ctx.wrap_socket(sock, server_hostname=host) as ssock:
+            with _SSL_CTX.wrap_socket(sock, server_hostname=host) as ssock:
                 cert = ssock.getpeercert()
                 if cert.get('notAfter'):
                     exp = datetime.strptime(cert['notAfter'], "%b %d %H:%M:%S %Y %Z")
-                    return 1 if (exp - datetime.utcnow()).days > 30 else 0
-        return 1
+                    verdict = 1 if (exp - datetime.utcnow()).days > 30 else 0
     except:
-        return -1
+        verdict = -1
+    if len(_ssl_cache) > 10000:
+        _ssl_cache.clear()
+    _ssl_cache[host] = (verdict, time.time())
+    return verdict
 
 def check_dns(domain):
     """Check DNS record"""
@@ -90,23 +239,144 @@ def check_dns(domain):
     except:
         return -1
 
+# The JS-trick signals live in attribute values and inline scripts, so both
+# scan paths test them as regex/substring checks against the full page.
+_MOUSEOVER_RE = re.compile(r'onmouseover\s*=')
+_RIGHTCLICK_RE = re.compile(r'event\.button\s*==\s*2')
+_POPUP_RE = re.compile(r'window\.open\s*\(')
+
+def _scan_html_dom(html):
+    """Same contract as _scan_html, built from one C-level DOM parse.
+
+    lexbor parses the page once into a tree; the per-feature collections
+    fall out of CSS queries instead of regex passes, which also behaves
+    sanely on malformed markup.
+    """
+    tree = LexborHTMLParser(html)
+
+    favicon = None
+    node = tree.css_first('link[rel*=icon]')
+    if node:
+        favicon = node.attributes.get('href') or None
+
+    anchors = []
+    for node in tree.css('a[href]'):
+        href = node.attributes.get('href')
+        if href:
+            anchors.append(href)
+
+    tags = []
+    for node in tree.css('meta[src], meta[href], script[src], script[href], link[src], link[href]'):
+        value = node.attributes.get('src') or node.attributes.get('href')
+        if value:
+            tags.append(value)
+
+    links = []
+    for node in tree.css('[src], [href]'):
+        value = node.attributes.get('src') or node.attributes.get('href')
+        if value:
+            links.append(value)
+
+    forms = [node.attributes.get('action') or '' for node in tree.css('form')]
+
+    flags = {
+        "mailto": 'mailto:' in html,
+        "mouseover": _MOUSEOVER_RE.search(html) is not None,
+        "rightclick": _RIGHTCLICK_RE.search(html) is not None,
+        "popup": _POPUP_RE.search(html) is not None,
+        "iframe": tree.css_first('iframe') is not None,
+    }
+    return favicon, links, anchors, tags, forms, flags
+
+def extract_html_features(html, domain):
+    """Extract the HTML-derived features for a fetched page.
+
+    domain is the page's registered domain, used to classify resources as
+    internal or external. Kept as a standalone function so a compiled
+    implementation of the scan can replace it wholesale.
+    """
+    # Case-fold the whole page once; every downstream comparison (domains,
+    # scheme prefixes, about:blank) wants lowercase anyway.
+    html = html.lower()
+    if LexborHTMLParser is not None:
+        favicon, links, anchors, tags, forms, flags = _scan_html_dom(html)
+    else:
+        favicon, links, anchors, tags, forms, flags = _scan_html(html)
+    features = {}
+
+    # Favicon
+    if favicon:
+        fav_domain = _registered_domain(_link_netloc(favicon))
+        features["Favicon"] = -1 if fav_domain and fav_domain != domain else 1
+    else:
+        features["Favicon"] = 1
+
+    # External resources — parse each netloc once, look up its registered
+    # domain through the shared cache
+    link_netlocs = [_link_netloc(l) for l in links]
+    ext_count = sum(1 for n in link_netlocs if n and not _same_registered_domain(domain, n))
+    ext_pct = (ext_count / len(links) * 100) if links else 0
+    features["Request_URL"] = 1 if ext_pct < 22 else (0 if ext_pct <= 61 else -1)
+
+    # Anchors
+    susp_anch = 0
+    for a in anchors:
+        if a.startswith(('#', 'javascript:', 'mailto:')):
+            susp_anch += 1
+        else:
+            n = _link_netloc(a)
+            if n and not _same_registered_domain(domain, n):
+                susp_anch += 1
+    anch_pct = (susp_anch / len(anchors) * 100) if anchors else 0
+    features["URL_of_Anchor"] = 1 if anch_pct < 31 else (0 if anch_pct <= 67 else -1)
+
+    # Meta/Script/Link tags
+    tag_netlocs = [_link_netloc(t) for t in tags]
+    ext_tags = sum(1 for n in tag_netlocs if n and not _same_registered_domain(domain, n))
+    tag_pct = (ext_tags / len(tags) * 100) if tags else 0
+    features["Links_in_tags"] = 1 if tag_pct < 17 else (0 if tag_pct <= 81 else -1)
+
+    # Form handlers
+    features["SFH"] = -1 if any(not f or 'about:blank' in f for f in forms) else 1
+
+    features["Submitting_to_email"] = -1 if flags["mailto"] else 1
+    features["on_mouseover"] = -1 if flags["mouseover"] else 1
+    features["RightClick"] = -1 if flags["rightclick"] else 1
+    features["popUpWidnow"] = -1 if flags["popup"] else 1
+    features["Iframe"] = -1 if flags["iframe"] else 1
+    return features
+
+# Optional compiled implementation of the HTML scan (same signature and
+# return shape). The pure-Python version above is the fallback.
+try:
+    from phishing_html_native import extract_html_features
+except ImportError:
+    pass
+
 def extract_features(url):
     """Extract all features from URL"""
     print(f"\n[*] Analyzing: {url}\n")
     
     parsed = urlparse(url)
     host = parsed.netloc.split(':')[0] if parsed.netloc else ''
-    ext = tldextract.extract(host)
+    ext = TLD_EXTRACT(host)
     domain = ext.registered_domain
     subdomain = ext.subdomain
     
-    status, html = fetch_content(url)
+    # The four network probes are independent I/O waits — issue them all at
+    # once so total wait is the slowest lookup, not the sum of all four.
+    fetch_future = _IO_POOL.submit(fetch_content, url)
+    age_future = _IO_POOL.submit(get_domain_age, domain)
+    ssl_future = _IO_POOL.submit(check_ssl, url, host)
+    dns_future = _IO_POOL.submit(check_dns, domain)
+
+    status, html = fetch_future.result()
     html = html or ''
-    
+
     features = {}
     
     # URL-based features (no HTML needed)
-    features["having_IP_Address"] = -1 if re.match(r'^\d+\.\d+\.\d+\.\d+$', host) else 1
+    features["having_IP_Address"] = -1 if _IP_RE.match(host) else 1
     
     length = len(url)
     features["URL_Length"] = 1 if length < 54 else (0 if length <= 75 else -1)
@@ -119,10 +389,10 @@ def extract_features(url):
     sub_count = len(subdomain.split('.')) if subdomain else 0
     features["having_Sub_Domain"] = 1 if sub_count <= 1 else (0 if sub_count == 2 else -1)
     
-    features["SSLfinal_State"] = check_ssl(url, host)
-    
+    features["SSLfinal_State"] = ssl_future.result()
+
     # Domain age
-    age_days = get_domain_age(domain)
+    age_days = age_future.result()
     age_val = 1 if age_days is None else (1 if age_days >= 365 else (0 if age_days >= 180 else -1))
     features["Domain_registeration_length"] = age_val
     features["age_of_domain"] = age_val
@@ -132,44 +402,7 @@ def extract_features(url):
     
     # HTML-based features
     if html:
-        # Favicon
-        fav = re.search(r'<link[^>]+rel=["\']?(?:icon|shortcut icon)["\']?[^>]+href=[\'"]([^\'"]+)', html, re.I)
-        if fav:
-            fav_domain = tldextract.extract(urlparse(fav.group(1)).netloc).registered_domain
-            features["Favicon"] = -1 if fav_domain and fav_domain != domain else 1
-        else:
-            features["Favicon"] = 1
-        
-        # External resources
-        links = re.findall(r'(?:src|href)=["\']([^"\']+)', html, re.I)
-        ext_count = sum(1 for l in links if urlparse(l).netloc and 
-                       tldextract.extract(urlparse(l).netloc).registered_domain != domain)
-        ext_pct = (ext_count / len(links) * 100) if links else 0
-        features["Request_URL"] = 1 if ext_pct < 22 else (0 if ext_pct <= 61 else -1)
-        
-        # Anchors
-        anchors = re.findall(r'<a[^>]+href=["\']([^"\']+)', html, re.I)
-        susp_anch = sum(1 for a in anchors if a.startswith(('#', 'javascript:', 'mailto:')) or
-                       (urlparse(a).netloc and tldextract.extract(urlparse(a).netloc).registered_domain != domain))
-        anch_pct = (susp_anch / len(anchors) * 100) if anchors else 0
-        features["URL_of_Anchor"] = 1 if anch_pct < 31 else (0 if anch_pct <= 67 else -1)
-        
-        # Meta/Script/Link tags
-        tags = re.findall(r'<(?:meta|script|link)[^>]+(?:src|href)=["\']([^"\']+)', html, re.I)
-        ext_tags = sum(1 for t in tags if urlparse(t).netloc and 
-                      tldextract.extract(urlparse(t).netloc).registered_domain != domain)
-        tag_pct = (ext_tags / len(tags) * 100) if tags else 0
-        features["Links_in_tags"] = 1 if tag_pct < 17 else (0 if tag_pct <= 81 else -1)
-        
-        # Form handlers
-        forms = re.findall(r'<form[^>]+action=["\']([^"\']*)', html, re.I)
-        features["SFH"] = -1 if any(not f or 'about:blank' in f.lower() for f in forms) else 1
-        
-        features["Submitting_to_email"] = -1 if re.search(r'mailto:', html, re.I) else 1
-        features["on_mouseover"] = -1 if re.search(r'onmouseover\s*=', html, re.I) else 1
-        features["RightClick"] = -1 if re.search(r'event\.button\s*==\s*2', html, re.I) else 1
-        features["popUpWidnow"] = -1 if re.search(r'window\.open\s*\(', html, re.I) else 1
-        features["Iframe"] = -1 if '<iframe' in html.lower() else 1
+        features.update(extract_html_features(html, domain))
     else:
         # No HTML - set defaults
         for feat in ["Favicon", "Request_URL", "URL_of_Anchor", "Links_in_tags", "SFH", 
@@ -178,7 +411,7 @@ def extract_features(url):
     
     features["Abnormal_URL"] = -1 if not domain or not parsed.scheme else 1
     features["Redirect"] = -1 if status and 300 <= status < 400 else 1
-    features["DNSRecord"] = check_dns(domain)
+    features["DNSRecord"] = dns_future.result()
     
     # Network features (unknown)
     for feat in ["web_traffic", "Page_Rank", "Google_Index", "Links_pointing_to_page", "Statistical_report"]:
@@ -188,31 +421,71 @@ def extract_features(url):
     
     return features
 
+# Features that depend only on the URL string itself — no network, no HTML.
+URL_ONLY_COLUMNS = [
+    "having_IP_Address", "URL_Length", "Shortining_Service", "having_At_Symbol",
+    "double_slash_redirecting", "Prefix_Suffix", "having_Sub_Domain", "port",
+    "HTTPS_token"
+]
+
+_SHORTENER_PATTERN = '|'.join(re.escape(s) for s in sorted(SHORTENERS))
+
+def batch_extract_url_features(urls):
+    """Compute the URL-only features for a whole batch of URLs at once.
+
+    These are pure string predicates, so pandas evaluates them as C loops
+    over the full URL list instead of per-URL Python branches. Returns a
+    DataFrame with URL_ONLY_COLUMNS, one row per input URL.
+    """
+    s = pd.Series(urls, dtype=object)
+    netloc = s.str.extract(r'^[a-z][a-z0-9+.\-]*://([^/?#]+)', flags=re.I, expand=False).fillna('')
+    host = netloc.str.split(':').str[0].str.lower()
+    path = s.str.extract(r'^[a-z][a-z0-9+.\-]*://[^/?#]*([^?#]*)', flags=re.I, expand=False).fillna('')
+
+    length = s.str.len()
+    sub_counts = host.map(_subdomain_count)
+    port = netloc.str.split(':').str[-1]
+
+    return pd.DataFrame({
+        "having_IP_Address": np.where(host.str.match(r'^\d+\.\d+\.\d+\.\d+$'), -1, 1),
+        "URL_Length": np.where(length < 54, 1, np.where(length <= 75, 0, -1)),
+        "Shortining_Service": np.where(host.str.contains(_SHORTENER_PATTERN), -1, 1),
+        "having_At_Symbol": np.where(s.str.contains('@', regex=False), -1, 1),
+        "double_slash_redirecting": np.where(path.str.contains('//', regex=False), -1, 1),
+        "Prefix_Suffix": np.where(host.str.contains('-', regex=False), -1, 1),
+        "having_Sub_Domain": np.where(sub_counts <= 1, 1, np.where(sub_counts == 2, 0, -1)),
+        "port": np.where(netloc.str.contains(':', regex=False) & ~port.isin(['80', '443']), -1, 1),
+        "HTTPS_token": np.where(host.str.contains('https', regex=False), -1, 1),
+    }, columns=URL_ONLY_COLUMNS)
+
 def save_csv(features, filename="url_features.csv"):
     """Save features to CSV"""
     row = [features.get(c, 1) for c in COLUMNS]
-    
-    with open(filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(COLUMNS)
-        writer.writerow(row)
-    
-    print(f"\n{'='*60}")
-    print(f"Features saved to: {filename}")
-    print(f"{'='*60}")
-    
-    susp = sum(1 for v in row if v == -1)
-    neut = sum(1 for v in row if v == 0)
-    legit = sum(1 for v in row if v == 1)
-    
-    print(f"\n(-1=Suspicious, 0=Neutral, 1=Legitimate)")
-    for c, v in zip(COLUMNS, row):
-        icon = "🔴" if v == -1 else ("🟡" if v == 0 else "🟢")
-        print(f"{icon} {c:30s}: {v:2d}")
-    
-    print(f"\n{'='*60}")
-    print(f"Summary: {susp} suspicious | {neut} neutral | {legit} legitimate")
-    print(f"{'='*60}\n")
+
+    pd.DataFrame([row], columns=COLUMNS).to_csv(filename, index=False)
+
+    # Shift values from {-1, 0, 1} to {0, 1, 2} and count all three in one
+    # C call: bincount returns [suspicious, neutral, legitimate].
+    susp, neut, legit = np.bincount(np.array(row, dtype=int) + 1, minlength=3)
+
+    icons = {-1: "🔴", 0: "🟡", 1: "🟢"}
+    lines = [
+        "",
+        "=" * 60,
+        f"Features saved to: {filename}",
+        "=" * 60,
+        "",
+        "(-1=Suspicious, 0=Neutral, 1=Legitimate)",
+    ]
+    lines += [f"{icons[v]} {c:30s}: {v:2d}" for c, v in zip(COLUMNS, row)]
+    lines += [
+        "",
+        "=" * 60,
+        f"Summary: {susp} suspicious | {neut} neutral | {legit} legitimate",
+        "=" * 60,
+        "",
+    ]
+    print('\n'.join(lines))
 
 def main():
     try:
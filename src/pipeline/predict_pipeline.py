@@ -2,22 +2,72 @@
 
 import os
 import sys
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 from src.logger import logging
 from src.exception import CustomException
 from src.constant import *
 from src.utils.main_utils import MainUtils
 
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+try:
+    import joblib
+except ImportError:
+    joblib = None
+
+try:
+    import xgboost as xgb
+except ImportError:
+    xgb = None
+
+from sklearn.pipeline import Pipeline
+
 class PredictionPipeline:
     def __init__(self):
         logging.info("Initializing PredictionPipeline...")
         self.utils = MainUtils()
         self.model = self._load_model()
+        self.onnx_session = self._load_onnx_session()
         
+    def _load_native_model(self) -> object:
+        """Rebuild the pipeline from the native XGBoost export when present.
+
+        The trainer writes model.ubj (the booster through XGBoost's C-level
+        saver) and preprocessor.joblib next to model.pkl. Loading that pair
+        skips replaying the booster through pickle — milliseconds instead of
+        hundreds of them. Anything missing or failing falls back to the
+        pickled pipeline.
+        """
+        if xgb is None or joblib is None:
+            return None
+        if not (os.path.exists("model.ubj") and os.path.exists("preprocessor.joblib")):
+            return None
+        try:
+            model = xgb.XGBClassifier()
+            model.load_model("model.ubj")
+            preprocessor = joblib.load("preprocessor.joblib", mmap_mode='r')
+            logging.info("Loaded native model artifacts: model.ubj, preprocessor.joblib")
+            return Pipeline(steps=[
+                ('preprocessor', preprocessor),
+                ('model', model)
+            ])
+        except Exception as e:
+            logging.warning(f"Could not load native model artifacts, using model.pkl: {e}")
+            return None
+
     def _load_model(self) -> object:
         try:
             local_model_path = "model.pkl"
 
+            model = self._load_native_model()
+            if model is not None:
+                return model
+
             if os.path.exists(local_model_path):
                 logging.info(f"Loading model from local path: {local_model_path}")
                 model = self.utils.load_object(file_path=local_model_path)
@@ -31,29 +81,111 @@ class PredictionPipeline:
             logging.critical(f"Failed to load model: {e}")
             raise CustomException(e, sys)
 
+    def _load_onnx_session(self) -> object:
+        """Load an optional int8 ONNX export of the model.
+
+        When a model.onnx (exported with skl2onnx using an Int8TensorType
+        input) sits next to model.pkl and onnxruntime is installed,
+        predictions run through onnxruntime's int8 kernels; the features are
+        tri-valued so nothing is lost to quantization. Otherwise the pickled
+        sklearn pipeline is used as before.
+        """
+        local_onnx_path = "model.onnx"
+        if onnxruntime is None or not os.path.exists(local_onnx_path):
+            return None
+        try:
+            session = onnxruntime.InferenceSession(
+                local_onnx_path, providers=["CPUExecutionProvider"]
+            )
+            logging.info(f"Loaded ONNX model from: {local_onnx_path}")
+            return session
+        except Exception as e:
+            logging.warning(f"Could not load {local_onnx_path}, using sklearn model: {e}")
+            return None
+
     def predict(self, input_data: pd.DataFrame) -> pd.DataFrame:
         try:
             logging.info(f"Running prediction on {input_data.shape[0]} records.")
             
-            data_to_predict = input_data.copy()
-            
-            if TARGET_COLUMN in data_to_predict.columns:
-                logging.info(f"Removing target column '{TARGET_COLUMN}' from input data")
-                data_to_predict = data_to_predict.drop(columns=[TARGET_COLUMN])
-            if 'Result' in data_to_predict.columns:
-                logging.info("Removing 'Result' column from input data")
-                data_to_predict = data_to_predict.drop(columns=['Result'])
-            
-            predictions = self.model.predict(data_to_predict)
-            
+            # One defensive copy serves as the result frame; dropping the
+            # label columns in a single call yields the model input without
+            # copying the data a second time.
             result_df = input_data.copy()
-            
-            target_column_mapping = {0: 'phishing', 1: 'safe'}
-            result_df['Result'] = [target_column_mapping.get(pred, 'unknown') for pred in predictions]
+            data_to_predict = result_df.drop(
+                columns=[TARGET_COLUMN, 'Result'], errors='ignore'
+            )
+
+            # Real feeds repeat the same URL (and therefore the same feature
+            # row) many times over. Score each distinct row once and fan the
+            # verdicts back out through an inverse index; when every row is
+            # already unique this costs one duplicated() scan and nothing
+            # else.
+            has_duplicates = data_to_predict.duplicated().any()
+            if has_duplicates:
+                unique_rows = data_to_predict.drop_duplicates()
+                lookup = unique_rows.reset_index(drop=True).reset_index(
+                    names='_uidx'
+                )
+                inverse_idx = data_to_predict.merge(
+                    lookup, on=list(data_to_predict.columns), how='left'
+                )['_uidx'].to_numpy()
+                logging.info(
+                    f"Deduplicated {data_to_predict.shape[0]} rows down to "
+                    f"{unique_rows.shape[0]} for prediction."
+                )
+                data_to_predict = unique_rows
+
+            if self.onnx_session is not None:
+                X = np.ascontiguousarray(data_to_predict.to_numpy(dtype=np.int8))
+                input_name = self.onnx_session.get_inputs()[0].name
+                predictions = self.onnx_session.run(None, {input_name: X})[0].ravel()
+            else:
+                # sklearn and XGBoost copy the input to a contiguous float
+                # array on every call anyway; casting once to float32 halves
+                # the bytes moved versus letting them upcast to float64, and
+                # handing over an ndarray skips the per-call DataFrame
+                # validation. Column order is already fixed upstream by
+                # MODEL_FEATURE_ORDER, and the features are tri-valued so
+                # float32 is exact.
+                X = np.ascontiguousarray(
+                    data_to_predict.to_numpy(dtype=np.float32, copy=False)
+                )
+                predictions = self.model.predict(X)
+
+            if has_duplicates:
+                predictions = np.asarray(predictions)[inverse_idx]
+
+            # Vectorized label lookup: one numpy fancy-index instead of a
+            # Python dict.get per row, with anything outside {0, 1} mapped to
+            # 'unknown' like the old dict fallback.
+            label_table = np.array(['phishing', 'safe'], dtype=object)
+            pred_idx = np.asarray(predictions, dtype=np.intp)
+            result_df['Result'] = np.where(
+                (pred_idx == 0) | (pred_idx == 1),
+                label_table[np.clip(pred_idx, 0, 1)],
+                'unknown'
+            )
             result_df['Result_Value'] = predictions
 
             logging.info("Prediction completed successfully.")
             return result_df
 
         except Exception as e:
-            raise CustomException(e, sys)
\ No newline at end of file
+            raise CustomException(e, sys)
+
+@lru_cache(maxsize=1)
+def get_pipeline() -> PredictionPipeline:
+    """Process-wide PredictionPipeline singleton.
+
+    Unpickling the model costs hundreds of milliseconds; every caller should
+    share the one loaded instance instead of paying that per construction.
+    """
+    pipeline = PredictionPipeline()
+    try:
+        # When the final step is an XGBoost model, let its booster use every
+        # core for prediction regardless of what n_jobs it was trained with.
+        booster = pipeline.model.named_steps['model'].get_booster()
+        booster.set_param({'nthread': os.cpu_count()})
+    except Exception:
+        pass
+    return pipeline
\ No newline at end of file
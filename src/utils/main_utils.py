@@ -8,6 +8,11 @@ import pickle
 import yaml
 import boto3
 
+try:
+    import joblib
+except ImportError:
+    joblib = None
+
 from src.constant import *
 from src.exception import CustomException
 from src.logger import logging
@@ -41,8 +46,13 @@ class MainUtils:
         logging.info("Entered the save_object method of MainUtils class")
 
         try:
-            with open(file_path, "wb") as file_obj:
-                pickle.dump(obj, file_obj)
+            if joblib is not None:
+                # joblib stores large numpy arrays as separate blocks, which
+                # lets load_object map them instead of copying them per worker
+                joblib.dump(obj, file_path)
+            else:
+                with open(file_path, "wb") as file_obj:
+                    pickle.dump(obj, file_obj)
 
             logging.info("Exited the save_object method of MainUtils class")
 
@@ -56,8 +66,19 @@ class MainUtils:
         logging.info("Entered the load_object method of MainUtils class")
 
         try:
-            with open(file_path, "rb") as file_obj:
-                obj = pickle.load(file_obj)
+            if joblib is not None:
+                # mmap_mode='r' keeps the model's arrays in the page cache,
+                # shared read-only across uvicorn workers instead of one
+                # private copy per process. Falls back to plain pickle for
+                # artifacts written before joblib was used.
+                try:
+                    obj = joblib.load(file_path, mmap_mode='r')
+                except Exception:
+                    with open(file_path, "rb") as file_obj:
+                        obj = pickle.load(file_obj)
+            else:
+                with open(file_path, "rb") as file_obj:
+                    obj = pickle.load(file_obj)
 
             logging.info("Exited the load_object method of MainUtils class")
 